@@ -67,26 +67,26 @@ from enum import Enum
 from pathlib import Path
 
 import typer
-from ansible.inventory.manager import InventoryManager
-from ansible.parsing.dataloader import DataLoader
-from ansible.vars.manager import VariableManager
 from rich.table import Table
 
 from .console import log
 from .convert import convert
-from .data import query
-from .file_system import create_directory, load_json_directory_with_age, load_json_file_with_age
+from .data import query, query_parts
+from .file_system import create_directory, load_json_file_with_age
 from .shell import shell
 
 app_name = sys.argv[0].rsplit("/", maxsplit=1)[-1]
 
+_BAD_RESPONSE_KEYS = ("failed", "unreachable")
+
 
 def _check_ansible_response(response, show_log=True):
     """Return False when there are issues found in Ansible JSON result."""
-    if "failed" in response and response["failed"] or "unreachable" in response and response["unreachable"]:
-        if show_log:
-            log.warning("failed retrieve requested data with Ansible: %s", response["msg"])
-        return False
+    for key in _BAD_RESPONSE_KEYS:
+        if response.get(key):
+            if show_log:
+                log.warning("failed retrieve requested data with Ansible: %s", response["msg"])
+            return False
 
     return True
 
@@ -119,7 +119,8 @@ def _get_inventory_files(inventories_directory: Path, sources: str | Path | Enum
             source = source.value
 
         if isinstance(source, str) and source == "all":
-            return [str(path) for path in inventories_directory.iterdir()]
+            with os.scandir(inventories_directory) as entries:
+                return [entry.path for entry in entries]
 
         if isinstance(source, str):
             if source.rstrip("/") == str(inventories_directory).rstrip("/"):
@@ -135,8 +136,7 @@ def _get_inventory_files(inventories_directory: Path, sources: str | Path | Enum
 class FactsViewer:
     """View facts."""
 
-    excludes: list[str] = []
-    includes: list[str] = []
+    __slots__ = ("directory", "cache_directory", "inventories_directory", "views", "includes", "excludes", "_key_parts")
 
     def __init__(self, views, directory: Path, inventories_directory: Path, cache_directory: Path):
         """Initialize facts manager."""
@@ -144,6 +144,12 @@ class FactsViewer:
         self.cache_directory = cache_directory
         self.inventories_directory = inventories_directory
         self.views = views
+        self.includes: list[str] = []
+        self.excludes: list[str] = []
+
+        self._key_parts = {
+            item["key"]: tuple(item["key"].split(".")) for view in views.values() for item in view
+        }
 
         if not self.directory.is_dir():
             log.warning(":person_facepalming: facts cache directory is empty: %s", directory)
@@ -159,7 +165,7 @@ class FactsViewer:
         columns = [f'[green]{row["ansible_fqdn"]}', row["age"]]
 
         for item in view:
-            value = query(row, item["key"])
+            value = query_parts(row, self._key_parts[item["key"]], item["key"])
             if "unit" in item:
                 columns.append(self._human_readable_fact_value(value, item["unit"]))
             else:
@@ -176,12 +182,14 @@ class FactsViewer:
         for item in view:
             table.add_column(item["description"])
 
+        add_row = table.add_row
+        columns = self._columns
+
         for row in rows:
             if "unreachable" in row:
-                table.add_row(f'[red]{row["hostname"]}', row["age"])
+                add_row(f'[red]{row["hostname"]}', row["age"])
             else:
-                columns = self._columns(view, row)
-                table.add_row(*columns)
+                add_row(*columns(view, row))
 
         return table
 
@@ -212,7 +220,7 @@ class FactsViewer:
 
         for view_cfg in self.views[view.value]:
             try:
-                value = query(facts, view_cfg["key"])
+                value = query_parts(facts, self._key_parts[view_cfg["key"]], view_cfg["key"])
                 if value:
                     value = self._human_readable_fact_value(value, view_cfg.get("unit"))
                     host_branch.add(f'[bold][dim]{view_cfg["description"]}[/dim][/bold]: {value}')
@@ -229,6 +237,8 @@ class FactsViewer:
 class FactsManager:
     """Manage facts."""
 
+    __slots__ = ("directory", "inventories_directory")
+
     def __init__(self, directory: Path, inventories_directory: Path):
         """Initialize facts manager."""
         self.directory = directory
@@ -236,20 +246,28 @@ class FactsManager:
 
     def load_directory(self, include: list[str] | None = None, exclude: list[str] | None = None):
         """Read facts from directory as Python dictionary."""
+        include_set = frozenset(include) if include else None
+        exclude_set = frozenset(exclude) if exclude else None
+
         facts = {}
 
-        for host, data in load_json_directory_with_age(self.directory).items():
+        for host in sorted(self.directory.iterdir()):
+            if not host.is_file():
+                continue
+
+            if include_set and host.name not in include_set:
+                continue
+
+            if exclude_set and host.name in exclude_set:
+                continue
+
+            data = load_json_file_with_age(host)
+
             if not _check_ansible_response(data, False):
                 facts[host] = {**data, "hostname": host.name, "age": data["age"]}
             elif "ansible_facts" in data:
                 facts[host] = {**data["ansible_facts"], "age": data["age"]}
 
-        if include:
-            facts = {host.name: fact for host, fact in facts.items() if host.name in include}
-
-        if exclude:
-            facts = {host_name: fact for host_name, fact in facts.items() if host_name not in exclude}
-
         return facts
 
     def load_host(self, host: str):
@@ -286,23 +304,20 @@ class FactsManager:
 
     def collect(self, inventories: str | Path | Enum | list[str | Path | Enum], target: str):
         """Collect facts."""
+        command = ["ansible"]
+
         for inventory_file in _get_inventory_files(self.inventories_directory, inventories):
-            shell(
-                "ansible",
-                "--inventory",
-                inventory_file,
-                "--module-name",
-                "gather_facts",
-                "--tree",
-                self.directory,
-                target,
-            )
+            command += ["--inventory", inventory_file]
+
+        command += ["--module-name", "gather_facts", "--tree", self.directory, target]
+
+        shell(*command)
 
 
 class Ansible:
     """Glue Ansible wrapper."""
 
-    _sources: list[str] = []
+    __slots__ = ("_sources", "_inventory", "_variable_manager")
 
     def __init__(
         self,
@@ -310,6 +325,10 @@ class Ansible:
         sources: str | Path | Enum | list[str | Path | Enum] = "all",
     ):
         """Initialize service."""
+        from ansible.inventory.manager import InventoryManager
+        from ansible.parsing.dataloader import DataLoader
+        from ansible.vars.manager import VariableManager
+
         loader = DataLoader()
         self._sources = _get_inventory_files(inventories_directory, sources)
         self._inventory = InventoryManager(loader=loader, sources=self._sources)
@@ -366,10 +385,20 @@ class AnsibleCompletion:
     def __init__(self, inventories_directory: Path):
         """Set path."""
         self.inventories_directory = inventories_directory
+        self._cache: dict[str, Ansible] = {}
+
+    def _get_ansible(self, inventory_name: str):
+        """Return Ansible instance for inventory, parse each inventory only once."""
+        ansible = self._cache.get(inventory_name)
+
+        if ansible is None:
+            ansible = self._cache[inventory_name] = Ansible(self.inventories_directory, inventory_name)
+
+        return ansible
 
     def complete_argument_inventory_group(self, ctx: typer.Context):
         """Inventory group completion."""
-        return Ansible(self.inventories_directory, ctx.params.get("inventory", "all")).groups
+        return self._get_ansible(ctx.params.get("inventory", "all")).groups
 
     def complete_argument_inventory_host(self, ctx: typer.Context):
         """Inventory host completion."""
@@ -378,11 +407,11 @@ class AnsibleCompletion:
         if not inventory_name:
             return []
 
-        return Ansible(self.inventories_directory, inventory_name).hosts
+        return self._get_ansible(inventory_name).hosts
 
     def complete_argument_host(self):
         """Inventory host completion."""
-        return Ansible(self.inventories_directory, "all").hosts
+        return self._get_ansible("all").hosts
 
     def complete_argument_inventory_target(self, ctx: typer.Context):
         """Inventory target (host or group) completion."""
@@ -390,5 +419,5 @@ class AnsibleCompletion:
         if not inventory_name:
             return []
 
-        ansible = Ansible(self.inventories_directory, inventory_name)
+        ansible = self._get_ansible(inventory_name)
         return ansible.hosts + ansible.groups
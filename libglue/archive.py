@@ -7,12 +7,16 @@ __copyright__ = "Copyright 2012-2022 Jasper Poppe"
 __license__ = "MIT"
 __status__ = "Development"
 
-import binascii
+import copy
 import hashlib
+import mmap
 import os
 import shutil
+import struct
+import subprocess
 import zipfile
 import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from shutil import move
 
@@ -37,6 +41,36 @@ def extract_file(zip_path: Path, name: str, destination: Path):
         zip.extract(name, destination)
 
 
+def _copy_member_raw(source: zipfile.ZipFile, info: zipfile.ZipInfo, target: zipfile.ZipFile, name: str | None = None):
+    """Copy an archive member to another archive without recompressing the data."""
+    source.fp.seek(info.header_offset)
+    header = source.fp.read(zipfile.sizeFileHeader)
+    name_length, extra_length = struct.unpack("<HH", header[26:30])
+    source.fp.seek(info.header_offset + zipfile.sizeFileHeader + name_length + extra_length)
+
+    target_info = copy.copy(info)
+    target_info.filename = name if name else info.filename
+    target_info.flag_bits &= ~0x08  # sizes are known up front, no data descriptor needed
+    target_info.header_offset = target.start_dir
+
+    zip64 = info.file_size > zipfile.ZIP64_LIMIT or info.compress_size > zipfile.ZIP64_LIMIT
+    target.fp.seek(target.start_dir)
+    target.fp.write(target_info.FileHeader(zip64))
+
+    remaining = info.compress_size
+    while remaining:
+        chunk = source.fp.read(min(remaining, 1 << 20))
+        if not chunk:
+            raise zipfile.BadZipFile(f"unexpected end of member data: {info.filename}")
+        target.fp.write(chunk)
+        remaining -= len(chunk)
+
+    target.start_dir = target.fp.tell()
+    target.filelist.append(target_info)
+    target.NameToInfo[target_info.filename] = target_info
+    target._didModify = True  # pylint: disable=protected-access
+
+
 def delete_file_from_zip(zip_path: Path, name: str):
     """Delete file from Zip archive."""
     log.info("delete file from archive: %s (%s)", name, zip_path)
@@ -45,16 +79,25 @@ def delete_file_from_zip(zip_path: Path, name: str):
     with zipfile.ZipFile(zip_path, "r") as source_zip:
         with zipfile.ZipFile(temp_file, "w") as temp_zip:
             for item in source_zip.infolist():
-                buffer = source_zip.read(item.filename)
                 if item.filename != name:
-                    temp_zip.writestr(item, buffer)
-            temp_zip.close()
-            source_zip.close()
+                    _copy_member_raw(source_zip, item, temp_zip)
 
     log.info("moving: %s -> %s", temp_file, zip_path)
     move(temp_file, zip_path)
 
 
+def _hash_zip_member(path: Path, name: str):
+    """Return sha1 checksum of a single zip member."""
+    sha1_hash = hashlib.sha1()
+
+    with zipfile.ZipFile(path) as zip_archive:
+        with zip_archive.open(name) as member_file:
+            while chunk := member_file.read(1 << 20):
+                sha1_hash.update(chunk)
+
+    return sha1_hash.hexdigest()
+
+
 def get_zip_checksums(path: Path, task_id: TaskID, progress: Progress):
     """Open zip file and returns a sha1 checksum of all the members of the zip."""
     checksums = {}
@@ -62,16 +105,16 @@ def get_zip_checksums(path: Path, task_id: TaskID, progress: Progress):
     with zipfile.ZipFile(path) as zip_archive:
         names = zip_archive.namelist()
 
-        progress.start_task(task_id)
-        progress.update(task_id, visible=True, description=path.name, total=len(names))
+    progress.start_task(task_id)
+    progress.update(task_id, visible=True, description=path.name, total=len(names))
 
-        for name in names:
-            progress.update(task_id, description=f"[magenta]{path.stem}[/]/[cyan]{name}")
-            with zip_archive.open(name) as member_file:
-                member_content = member_file.read()
+    with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as executor:
+        futures = {executor.submit(_hash_zip_member, path, name): name for name in names}
 
-            sha1_checksum = hashlib.sha1(member_content).hexdigest()
-            checksums[name] = sha1_checksum
+        for future in as_completed(futures):
+            name = futures[future]
+            progress.update(task_id, description=f"[magenta]{path.stem}[/]/[cyan]{name}")
+            checksums[name] = future.result()
             progress.update(task_id, advance=1)
 
     return checksums
@@ -84,7 +127,7 @@ def append(path, sources):
             with zipfile.ZipFile(source_archive, "r") as _source:
                 for file in _source.filelist:
                     if file.filename in source_roms:
-                        _target.writestr(source_roms[file.filename], _source.read(file.filename))
+                        _copy_member_raw(_source, file, _target, source_roms[file.filename])
 
 
 def _temp_archive_name(path):
@@ -98,7 +141,7 @@ def create(path, sources):
             with zipfile.ZipFile(source_archive, "r") as source:
                 for file in source.filelist:
                     if file.filename in source_roms:
-                        _temp_archive.writestr(source_roms[file.filename], source.read(file.filename))
+                        _copy_member_raw(source, file, _temp_archive, source_roms[file.filename])
 
     shutil.move(_temp_archive_name(path), path)
 
@@ -111,9 +154,9 @@ def rename(path, names):
                 print(file.filename)
                 if file.filename in names:
                     print("renaming:", file.filename, "->", names[file.filename])
-                    _temp_archive.writestr(names[file.filename], source.read(file.filename))
+                    _copy_member_raw(source, file, _temp_archive, names[file.filename])
                 else:
-                    _temp_archive.writestr(file.filename, source.read(file.filename))
+                    _copy_member_raw(source, file, _temp_archive)
 
     print("writing archive:", path)
     shutil.move(_temp_archive_name(path), path)
@@ -128,10 +171,15 @@ def scan_zip(path, md5=False, clean=False):
 
                 if extension in offsets:
                     offset = offsets[extension]
-                    crc = binascii.crc32(archive.read(info.filename)[offset:]).lower()  #  & 0xFFFFFFFF
+                    crc_value = 0
+                    with archive.open(info.filename) as data:
+                        data.read(offset)
+                        while chunk := data.read(1 << 20):
+                            crc_value = zlib.crc32(chunk, crc_value)
+                    crc = f"{crc_value & 0xFFFFFFFF:08x}"
                 else:
                     offset = 0
-                    crc = hex(info.CRC)[2:].zfill(8).lower()
+                    crc = f"{info.CRC:08x}"
 
                 size = info.file_size - offset
 
@@ -140,7 +188,9 @@ def scan_zip(path, md5=False, clean=False):
                 if md5:
                     with archive.open(info.filename) as data:
                         file_hash = hashlib.md5()
-                        while chunk := data.read(1024**2 * 16)[offset:]:  # read in chunks of 16MB
+                        if offset:
+                            data.read(offset)
+                        while chunk := data.read(1024**2 * 16):  # read in chunks of 16MB
                             file_hash.update(chunk)
                         yield result | {"md5": file_hash.hexdigest()}
                 else:
@@ -158,34 +208,57 @@ def scan_zip(path, md5=False, clean=False):
             print(f"ERROR - archive ({error}): {path}")
 
 
+def _scan_7z_binary(path):
+    """List 7-Zip archive members with the native 7z binary."""
+    process = subprocess.run(["7z", "l", "-slt", str(path)], capture_output=True, text=True, check=True)
+    _, _, listing = process.stdout.partition("----------")
+
+    for block in listing.split("\n\n"):
+        entry = dict(line.split(" = ", 1) for line in block.splitlines() if " = " in line)
+
+        if not entry.get("Path") or entry.get("Folder") == "+" or "D" in entry.get("Attributes", ""):
+            continue
+
+        yield {
+            "path": path,
+            "file_name": entry["Path"],
+            "crc": entry.get("CRC", "").zfill(8).lower(),
+            "size": entry.get("Size", "0"),
+            "matches": [],
+        }
+
+
 def scan_7z(path, md5=False, clean=False):
     """Scan 7-Zip archive."""
+    if md5:
+        print("implement md5 calculation for 7zip")
+
     try:
+        if shutil.which("7z"):
+            yield from _scan_7z_binary(path)
+            return
+
         with py7zr.SevenZipFile(path, mode="r") as archive:
             for entry in archive.list():
-                if md5:
-                    print("implement md5 calculation for 7zip")
-
                 yield {
                     "path": path,
                     "file_name": entry.filename,
-                    "crc": hex(entry.crc32)[2:].zfill(8).lower(),
+                    "crc": f"{entry.crc32:08x}",
                     "size": str(entry.uncompressed),
                     "matches": [],
                 }
-    except (OSError, py7zr.Bad7zFile):
+    except (OSError, subprocess.CalledProcessError, py7zr.Bad7zFile):
         print("error:", path, clean)
 
 
 def file_crc(file_name):
     """Calculate file crc."""
-    prev = 0
+    with open(file_name, "rb") as file_pointer:
+        if not os.fstat(file_pointer.fileno()).st_size:
+            return f"{0:08x}"
 
-    for eachLine in open(file_name, "rb"):
-        prev = zlib.crc32(eachLine, prev)
-
-    crc = "%X" % (prev & 0xFFFFFFFF)
-    return crc.lower()
+        with mmap.mmap(file_pointer.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return f"{zlib.crc32(data) & 0xFFFFFFFF:08x}"
 
 
 def scan_file(path, md5=False, clean=False):
@@ -203,14 +276,11 @@ def scan_file(path, md5=False, clean=False):
 
 
 def scan_directory(directory, md5, clean):
-    """Scan directory with archives."""
-    result = []
-    files = os.listdir(directory)
-    total_files = len(files)
-
-    for index, file_name in enumerate(files):
-        for file in scan_file(os.path.join(directory, file_name), md5, clean):
-            print(f"scanning archive: {index + 1} of {total_files}", end="\r")  # , flush=True
-            result.append(file)
-
-    return result
+    """Scan directory with archives, yield scanned file entries."""
+    with os.scandir(directory) as entries:
+        paths = [entry.path for entry in entries]
+    total_files = len(paths)
+
+    for index, path in enumerate(paths):
+        print(f"scanning archive: {index + 1} of {total_files}", end="\r")  # , flush=True
+        yield from scan_file(path, md5, clean)
@@ -15,52 +15,58 @@ __license__ = "MIT"
 __status__ = "Development"
 
 
+import atexit
+import functools
 import getpass
-import importlib.util
 import logging
 import os
+import shutil
+import stat
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
-from random import randint
+from random import choices
+from types import GeneratorType
 from typing import Any, Generator
 
 import typer
-import yaml
 from _collections_abc import dict_keys
 from rich import print, print_json
 from rich.console import Console
 from rich.highlighter import Highlighter
 from rich.logging import RichHandler
-from rich.panel import Panel
 from rich.pretty import pprint
-from rich.syntax import Syntax
 from rich.table import Table
-from rich.traceback import install
 from rich.tree import Tree
 
 from .themes import DRACULA
 from .types import RenderTarget
 
-install()
-
 log = logging.getLogger("rich")
 
 console = Console()
 logConsole = Console(stderr=True)
 recordConsole = Console(record=True)
 
+if logConsole.is_terminal:
+    from rich.traceback import install
+
+    install()
+
+_EXPORT_POOL = ThreadPoolExecutor(max_workers=4)
+atexit.register(_EXPORT_POOL.shutdown)
+
 CONSOLE_HTML_FORMAT = """\
 <!DOCTYPE html>
-
 <head>
   <meta charset="UTF-8">
   <style>
     {stylesheet}
     body {{ color: {foreground}; background-color: {background}; }}
-    pre {{ white-space: pre-wrap; white-space: -pre-wrap; word-wrap: break-word; }}
+    pre {{ white-space: pre-wrap; word-wrap: break-word; }}
     ::selection {{ background: #44475a; }}
   </style>
 </head>
-
 <html>
 <body>
   <code>
@@ -75,6 +81,20 @@ logging.basicConfig(
 )
 
 
+def _yaml_default_representer(dumper, data):
+    """Remove Ansible references."""
+    return dumper.represent_scalar("tag:yaml.org,2002:str", str(data))
+
+
+@functools.cache
+def _yaml():
+    """Import PyYAML on first use and register the fallback representer once."""
+    import yaml
+
+    yaml.representer.SafeRepresenter.add_representer(None, _yaml_default_representer)
+    return yaml
+
+
 class Styles:
     """Custom styles."""
 
@@ -88,10 +108,19 @@ class Styles:
 class Links:
     """Rich links."""
 
+    _ssh_template = f"[{Styles.host}][link ssh:%s]%s[/link ssh:%s][/{Styles.host}]"
+
     @staticmethod
+    @functools.lru_cache(maxsize=256)
     def ssh(host: str):
         """Return SSH link."""
-        return f"[{styles.host}][link ssh:{host}]{host}[/link ssh:{host}][/{styles.host}]"
+        return Links._ssh_template % (host, host, host)
+
+
+@functools.lru_cache(maxsize=512)
+def _stylize_key(key: str):
+    """Stylize key."""
+    return f"[bold][green]{key}[/bold][/green]:"
 
 
 class ConsoleRender:
@@ -99,31 +128,53 @@ class ConsoleRender:
 
     theme = "dracula"
     tree_list_keys = ("name", "node")
+    max_rows = 1000
 
     def __init__(self, data, export: Path | None = None):
         """Initialize class variables."""
         self.console = console
         self.export = export
+        self._export_suffix = None
+        self._export_str = None
 
         if export:
-            if export.suffix in (".html", ".svg"):
+            suffix = export.suffix
+            if suffix in (".html", ".svg"):
+                self._export_suffix = suffix
+                self._export_str = str(export)
                 self.console = Console(force_terminal=True, color_system="truecolor", record=True, width=4000)
             else:
-                log.error("export only supports HTML and SVG format (invalid file extension: %s)", export.suffix)
+                log.error("export only supports HTML and SVG format (invalid file extension: %s)", suffix)
                 raise SystemExit(1)
 
-        if isinstance(data, (Generator, dict_keys)):
-            self.data = list(data)
-        else:
-            self.data = data
+        self.data = data
+
+    @classmethod
+    def from_simple(cls, data):
+        """Construct a renderer for the common no-export case, skipping the export checks."""
+        render = cls.__new__(cls)
+        render.console = console
+        render.export = None
+        render._export_suffix = None
+        render._export_str = None
+        render.data = data
+        return render
+
+    def _materialize(self):
+        """Materialize streamed data for renderers that need it all at once."""
+        if isinstance(self.data, (GeneratorType, dict_keys)):
+            self.data = list(self.data)
+        return self.data
 
     def _export(self):
-        """Export console output as HTML or SVG."""
-        if self.export and self.export.suffix == ".html":
-            self.console.save_html(str(self.export), theme=DRACULA, code_format=CONSOLE_HTML_FORMAT, clear=True)
-            log.info(":factory: exported console output as HTML: %s", self.export)
-        elif self.export and self.export.suffix == ".svg":
-            self.console.save_svg(str(self.export), theme=DRACULA, clear=True)
+        """Export console output as HTML or SVG in the background."""
+        if self._export_suffix == ".html":
+            _EXPORT_POOL.submit(
+                self.console.save_html, self._export_str, theme=DRACULA, code_format=CONSOLE_HTML_FORMAT, clear=True
+            )
+            log.info(":factory: exporting console output as HTML: %s", self.export)
+        elif self._export_suffix == ".svg":
+            _EXPORT_POOL.submit(self.console.save_svg, self._export_str, theme=DRACULA, clear=True)
 
     def _tree_from_list(self):
         """Render tree from list."""
@@ -134,14 +185,14 @@ class ConsoleRender:
             return
 
         tree_data = {}
+        key_set = frozenset(self.tree_list_keys)
 
         for item in self.data:
-            for tree_list_key in self.tree_list_keys:
-                if tree_list_key in item:
-                    name = item[tree_list_key]
-                    del item[tree_list_key]
-                    tree_data[name] = item
-                    break
+            matches = item.keys() & key_set
+            if matches:
+                # keep the tuple's preference order, set iteration order is not deterministic
+                key = next(key for key in self.tree_list_keys if key in matches)
+                tree_data[item.pop(key)] = item
             else:
                 log.warning(":palm_tree: no tree list key found found in item: %s (%s)", item, self.tree_list_keys)
                 log.warning(":light_bulb: if it makes sense to add a key to the `tree list keys`, please open a PR")
@@ -149,20 +200,17 @@ class ConsoleRender:
         if tree_data:
             self.data = tree_data
 
-    def _stylize_key(self, key: str):
-        """Stylize key."""
-        return f"[bold][green]{key}[/bold][/green]:"
-
     def json(self):
         """Render data as JSON."""
-        print_json(data=self.data)
+        print_json(data=self._materialize())
         self._export()
 
     def raw(self):
         """Render raw data."""
-        if isinstance(self.data, (list, tuple)):
-            for item in self.data:
-                print(item)
+        if isinstance(self.data, (list, tuple, GeneratorType, dict_keys)):
+            items = iter(self.data)
+            while batch := list(islice(items, 512)):
+                print(*batch, sep="\n")
         else:
             self.json()
 
@@ -170,31 +218,25 @@ class ConsoleRender:
 
     def pretty(self):
         """Pretty print data."""
-        pprint(self.data)
+        pprint(self._materialize())
         self._export()
 
     def yaml(self):
         """Render data as YAML."""
+        from rich.syntax import Syntax
 
-        def default_representer(dumper, data):
-            """Remove Ansible references."""
-            return dumper.represent_scalar("tag:yaml.org,2002:str", str(data))
-
-        yaml.representer.SafeRepresenter.add_representer(None, default_representer)
-
-        self.console.print(Syntax(yaml.safe_dump(self.data), "yaml", theme=self.theme))
-
+        self.console.print(Syntax(_yaml().safe_dump(self._materialize()), "yaml", theme=self.theme))
         self._export()
 
     def _parse_tree_dict_branch(self, tree: Tree, branch_key: str, node: dict) -> None:
         """Render tree dict branch."""
-        branch = tree.add(self._stylize_key(branch_key))
+        branch = tree.add(_stylize_key(branch_key))
 
         for key, value in node.items():
             if isinstance(value, dict):
                 self._parse_tree_branch(branch, value)
-            elif isinstance(value, (dict, int, str)):
-                branch.add(f"{self._stylize_key(key)} {value}")
+            elif isinstance(value, (int, str)):
+                branch.add(f"{_stylize_key(key)} {value}")
             elif isinstance(value, list):
                 sub_branch = branch.add(f"[bold][dim]{key}")
                 for sub_item in value:
@@ -205,27 +247,46 @@ class ConsoleRender:
     def _parse_tree_list_branch(self, tree: Tree, branch_key: str, node: list) -> None:
         """Render tree list branch."""
         if len(node) < 2:
-            tree.add(f"{self._stylize_key(branch_key)} {node}")
+            tree.add(f"{_stylize_key(branch_key)} {node}")
         else:
-            branch = tree.add(self._stylize_key(branch_key))
+            branch = tree.add(_stylize_key(branch_key))
             for item in node:
                 branch.add(item)
 
+    def _parse_tree_scalar_branch(self, tree: Tree, branch_key: str, node: Any) -> None:
+        """Render tree scalar branch."""
+        tree.add(f"{_stylize_key(branch_key)} {node}")
+
+    _tree_dispatch = {
+        dict: _parse_tree_dict_branch,
+        list: _parse_tree_list_branch,
+        bool: _parse_tree_scalar_branch,
+        str: _parse_tree_scalar_branch,
+    }
+
     def _parse_tree_branch(self, tree: Tree, data: Any) -> None:
-        """Render tree branch."""
+        """Render tree branches depth-first so siblings keep their insertion order."""
+        dispatch = self._tree_dispatch
+
         for branch_key, node in data.items():
-            if isinstance(node, dict):
-                self._parse_tree_dict_branch(tree, branch_key, node)
-            elif isinstance(node, list):
-                self._parse_tree_list_branch(tree, branch_key, node)
-            elif isinstance(node, (bool, str)):
-                tree.add(f"{self._stylize_key(branch_key)} {node}")
-            else:
+            handler = dispatch.get(type(node))
+
+            if handler is None:
+                for node_type, fallback_handler in dispatch.items():
+                    if isinstance(node, node_type):
+                        handler = fallback_handler
+                        break
+
+            if handler is None:
                 log.warning(":palm_tree: render tree target is compatible with `list` or `dict` not: %s", type(node))
+                continue
+
+            handler(self, tree, branch_key, node)
 
     def tree(self):
         """Render simple tree."""
         tree = Tree(":palm_tree::evergreen_tree::tanabata_tree::christmas_tree:", guide_style="bold bright_blue")
+        self._materialize()
 
         if isinstance(self.data, list):
             self._tree_from_list()
@@ -235,17 +296,31 @@ class ConsoleRender:
             self.console.print(tree)
             self._export()
 
+    def _visible_rows(self, total: int):
+        """Return the number of rows to render, truncating huge tables on terminals."""
+        if total > self.max_rows and not self.export and self.console.is_terminal:
+            return shutil.get_terminal_size().lines * 2
+
+        return total
+
     def table(self):
         """Render simple table."""
         table = Table(show_header=False, expand=False)
 
         if isinstance(self.data, dict):
-            for key, value in self.data.items():
-                if isinstance(value, str):
-                    table.add_row(key, value)
-                else:
-                    table.add_row(key, str(value))
+            visible = self._visible_rows(len(self.data))
+            add_row = table.add_row
+            for key, value in islice(self.data.items(), visible):
+                add_row(key, str(value))
+            if visible < len(self.data):
+                table.add_row(f"[dim]... ({len(self.data) - visible} more rows)")
         elif isinstance(self.data, list):
+            visible = self._visible_rows(len(self.data))
+            for value in islice(self.data, visible):
+                table.add_row(value)
+            if visible < len(self.data):
+                table.add_row(f"[dim]... ({len(self.data) - visible} more rows)")
+        elif isinstance(self.data, (GeneratorType, dict_keys)):
             for value in self.data:
                 table.add_row(value)
         else:
@@ -256,18 +331,34 @@ class ConsoleRender:
         self._export()
 
 
+_RAINBOW_STYLES = tuple(f"color({color})" for color in range(200, 221))
+
+
 class RainbowHighlighter(Highlighter):
     """Rainbow highlighter."""
 
     def highlight(self, text):
         """Highlight strings."""
-        for index in range(len(text)):
-            text.stylize(f"color({randint(200, 220)})", index, index + 1)
-            text.style = "bold"
+        text.style = "bold"
+        stylize = text.stylize
+        start = 0
+        previous = None
+
+        for index, style in enumerate(choices(_RAINBOW_STYLES, k=len(text))):
+            if style != previous:
+                if previous is not None:
+                    stylize(previous, start, index)
+                start = index
+                previous = style
+
+        if previous is not None:
+            stylize(previous, start, len(text))
 
 
 def panel(rich_text: str):
     """Print text in panel."""
+    from rich.panel import Panel
+
     console.print(Panel(rich_text))
 
 
@@ -278,27 +369,42 @@ def print_condensed(value: str | list, prefix: str | None = None):
     Rich adds new line character after representing a list, we strip those by setting end to ''
     and print a new line when the instance of `value` is not of type list.
     """
+    end = "" if type(value) is list else "\n"
+
     if prefix:
-        console.print(f"{prefix}", value, end="")
+        console.print(f"{prefix}", value, end=end)
     else:
-        console.print(value, end="")
+        console.print(value, end=end)
+
 
-    if not isinstance(value, list):
-        print()
+_PLUGIN_CACHE: dict[tuple[str, int], Any] = {}
 
 
 def load_cli_plugin(cli, entrypoint: str, *args: str):
     """Load CLI plugin."""
-    if not os.path.isfile(entrypoint):
-        return
+    import importlib.util
 
-    spec = importlib.util.spec_from_file_location("plugin", entrypoint)
+    try:
+        entrypoint_stat = os.stat(entrypoint)
+    except OSError:
+        return
 
-    if spec is None:
+    if not stat.S_ISREG(entrypoint_stat.st_mode):
         return
 
-    module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(module)  # type: ignore
+    cache_key = (entrypoint, entrypoint_stat.st_mtime_ns)
+    module = _PLUGIN_CACHE.get(cache_key)
+
+    if module is None:
+        spec = importlib.util.spec_from_file_location("plugin", entrypoint)
+
+        if spec is None:
+            return
+
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)  # type: ignore
+        _PLUGIN_CACHE[cache_key] = module
+
     module.main(cli, *args)
 
 
@@ -309,37 +415,52 @@ def render_raw(data: list | dict | Table | Tree | Generator[Any, None, None], pa
     console_render._export()
 
 
+_RENDER_DISPATCH = {
+    RenderTarget.JSON: "json",
+    RenderTarget.PRETTY: "pretty",
+    RenderTarget.RAW: "raw",
+    RenderTarget.TABLE: "table",
+    RenderTarget.TREE: "tree",
+    RenderTarget.YAML: "yaml",
+}
+
+
 def render_as(
     data: list | dict | Generator[Any, None, None],
     target: RenderTarget = RenderTarget.PRETTY,
     export: Path | None = None,
 ) -> None:
     """Render data to console."""
-    console_render = ConsoleRender(data, export)
-
-    if target == RenderTarget.JSON:
-        console_render.json()
-    elif target == RenderTarget.PRETTY:
-        console_render.pretty()
-    elif target == RenderTarget.RAW:
-        console_render.raw()
-    elif target == RenderTarget.TABLE:
-        console_render.table()
-    elif target == RenderTarget.TREE:
-        console_render.tree()
-    elif target == RenderTarget.YAML:
-        console_render.yaml()
-    else:
+    method = _RENDER_DISPATCH.get(target)
+
+    if method is None:
         log.error("render target unknown: %s", target)
+        return
+
+    if export is None and type(data) in (list, dict):
+        console_render = ConsoleRender.from_simple(data)
+    else:
+        console_render = ConsoleRender(data, export)
+
+    getattr(console_render, method)()
+
+
+@functools.cache
+def _password_prompt_stream():
+    """Open the controlling terminal once for password prompts."""
+    try:
+        return open("/dev/tty", "w")
+    except OSError:
+        return None
 
 
 def read_password_or_exit(type: str):
     """Get password from user input or exit."""
-    password = getpass.getpass(f"Enter {type} password: ")
+    password = getpass.getpass(f"Enter {type} password: ", stream=_password_prompt_stream())
 
     if not password:
-        log.warning(":person_facepalming: {type} requires a password")
-        raise SystemExit(1)
+        log.warning(":person_facepalming: %s requires a password", type)
+        raise typer.Exit(1)
 
     return password
 
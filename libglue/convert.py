@@ -6,12 +6,21 @@ __license__ = "MIT"
 __status__ = "Development"
 
 
-import humanfriendly
-from dateutil import parser
+import functools
+
+
+@functools.cache
+def _humanfriendly():
+    """Import humanfriendly on first use."""
+    import humanfriendly
+
+    return humanfriendly
 
 
 def humanize_time(time: str, format: str = "%d %b, %Y %H:%M") -> str:
     """Return human readable time object."""
+    from dateutil import parser
+
     return parser.parse(time).strftime(format)
 
 
@@ -30,22 +39,26 @@ def format_human_time(time_in_seconds: int):
     return f"{days} days, {hours:02d}:{minutes:02d}:{seconds:02d}"
 
 
+_CONVERTERS = {
+    ("seconds", "human"): lambda value, max_units: _humanfriendly().format_timespan(value, max_units=max_units),
+    ("seconds", "humanfriendly"): lambda value, max_units: _humanfriendly().format_timespan(
+        int(value), max_units=max_units
+    ),
+    ("MB", "humanfriendly"): lambda value, max_units: _humanfriendly().format_size(
+        int(float(value) * 1_000_000), binary=True
+    ),
+    ("bytes", "humanfriendly"): lambda value, max_units: _humanfriendly().format_size(int(value), binary=True),
+}
+
+
 def convert(value, from_unit, to_unit, max_units=1):
     """Convert value between units."""
     if from_unit == to_unit:
         return value
 
-    if from_unit == "seconds" and to_unit == "human":
-        return humanfriendly.format_timespan(value, max_units=max_units)
-
-    if from_unit == "seconds" and to_unit == "humanfriendly":
-        return humanfriendly.format_timespan(int(value), max_units=max_units)
-
-    if from_unit == "MB" and to_unit == "humanfriendly":
-        size = humanfriendly.parse_size(f"{value}{from_unit}")
-        return humanfriendly.format_size(size, binary=True)
+    converter = _CONVERTERS.get((from_unit, to_unit))
 
-    if from_unit == "bytes" and to_unit == "humanfriendly":
-        return humanfriendly.format_size(int(value), binary=True)
+    if converter is None:
+        raise ValueError(f"conversion for `{from_unit} to {to_unit}` is not implemented")
 
-    raise ValueError(f"conversion for `{from_unit} to {to_unit}` is not implemented")
+    return converter(value, max_units)
@@ -6,20 +6,47 @@ __license__ = "MIT"
 __status__ = "Development"
 
 import difflib
+import functools
 import hashlib
 import json
 import re
+import string
 import unicodedata
-from abc import abstractmethod
+from operator import itemgetter
 from pathlib import Path
 from typing import Any, Dict, List
 from xml.etree import ElementTree
 
+import simdjson
 import yaml
 
+try:
+    from yaml import CSafeDumper as _SafeDumper
+except ImportError:
+    from yaml import SafeDumper as _SafeDumper
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
+
 from .console import log
 from .shell import shell
 
+_SLUG_STRIP_RE = re.compile(r"[^\w\s-]")
+_SLUG_DASH_RE = re.compile(r"[-\s]+")
+_SLUG_COLLAPSE_RE = re.compile(r"--+")
+_SLUG_TRANSLATE_TABLE = {
+    codepoint: "-" if chr(codepoint) in string.whitespace else None
+    for codepoint in range(128)
+    if chr(codepoint) not in string.ascii_lowercase + string.digits + "-_"
+}
+
 
 class Struct:
     """Dict to class."""
@@ -33,7 +60,7 @@ class Struct:
         return self.__dict__.get(_key)
 
 
-class ExplicitDumper(yaml.SafeDumper):  # pylint: disable=too-many-ancestors
+class ExplicitDumper(_SafeDumper):  # pylint: disable=too-many-ancestors
     """YAML dumper that will never emit aliases."""
 
     def ignore_aliases(self, _data):
@@ -44,7 +71,6 @@ class ExplicitDumper(yaml.SafeDumper):  # pylint: disable=too-many-ancestors
 class IndentAllDumper(yaml.Dumper):
     """Custom YAML dumper which indents all elements for improved readability."""
 
-    @abstractmethod
     def increase_indent(self, flow: bool = False, indentless: bool = False) -> None:
         """Override the increase_indent method."""
         super().increase_indent(flow, False)  # type: ignore
@@ -62,17 +88,17 @@ def load_command_json(command: List[str], env: Dict[str, str] | None = None, cwd
 
 def sort_dictionary(dictionary: Dict[Path, Any]):
     """Sort Python dictionary by key."""
-    return dict(sorted(dictionary.items(), key=lambda item: item[0]))
+    return dict(sorted(dictionary.items(), key=itemgetter(0)))
 
 
 def sort_dictionary_by_value(dictionary: Dict[str, Any]):
     """Sort Python dictionary by value."""
-    return sorted(dictionary.items(), key=lambda item: (item[1], item[0]))
+    return sorted(dictionary.items(), key=itemgetter(1, 0))
 
 
 def sort_list_by_dictionary_value(items: list[Dict[str, Any]], key: str):
     """Sort Python list with dictionaries by dictionary value."""
-    return sorted(items, key=lambda dictionary: dictionary[key])
+    return sorted(items, key=itemgetter(key))
 
 
 def dump_yaml(data: dict[Any, Any], explicit_start: bool = True):
@@ -87,10 +113,18 @@ def dump_yaml(data: dict[Any, Any], explicit_start: bool = True):
     )
 
 
+def dump_json(data: Any) -> str:
+    """Dump Python object as a compact JSON string."""
+    if orjson:
+        return orjson.dumps(data).decode()
+
+    return json.dumps(data)
+
+
 def load_json(json_data: str):
     """Load JSON and return Python dictionary."""
     try:
-        return json.loads(json_data)
+        return simdjson.loads(json_data)
     except (ValueError, TypeError) as error:
         log.error("JSON data: %s", json_data)
         log.error("failed to load JSON string (%s)", error)
@@ -105,8 +139,8 @@ def reindent(string: str, number_of_spaces: int):
 
 
 def hash_string(text: str):
-    """Convert string to MD5 hash."""
-    return hashlib.md5(text.encode()).hexdigest()
+    """Convert string to a 32 character BLAKE2b hash."""
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
 
 
 def path_list_to_dict(data: Dict) -> Dict:
@@ -116,13 +150,21 @@ def path_list_to_dict(data: Dict) -> Dict:
 
         value = data.pop(path)
 
-        *folders, subpath = path.strip("/").split("/")
+        start = 0
+        end = len(path)
+        while start < end and path[start] == "/":
+            start += 1
+        while end > start and path[end - 1] == "/":
+            end -= 1
 
-        for folder in folders:
-            sub_dict = working_dict.setdefault(folder, {})
+        while (slash := path.find("/", start, end)) >= 0:
+            sub_dict = working_dict.setdefault(path[start:slash], {})
             if not isinstance(sub_dict, dict):
                 raise ValueError("Inconsistent values detected")
             working_dict = sub_dict
+            start = slash + 1
+
+        subpath = path[start:end]
 
         if subpath in working_dict:
             raise ValueError("Inconsistent values detected")
@@ -132,49 +174,67 @@ def path_list_to_dict(data: Dict) -> Dict:
 
 def load_xml_file(path: Path):
     """Return XML root."""
+    if lxml_etree is not None:
+        return lxml_etree.parse(str(path))
+
     return ElementTree.parse(path)
 
 
 def write_xml(path: Path, root_element):
     """Write XML tree to file."""
     log.debug("writing XML file: %s", path)
+
+    if lxml_etree is not None and isinstance(root_element, lxml_etree._Element):  # pylint: disable=protected-access
+        tree = lxml_etree.ElementTree(root_element)
+        tree.write(str(path), xml_declaration=True, encoding="utf-8", pretty_print=True)
+        return
+
     tree = ElementTree.ElementTree(root_element)
     ElementTree.indent(tree, space=2 * " ", level=0)
     tree.write(path, xml_declaration=True, encoding="utf-8")
 
 
-def diff(before: str | Any, after: str | Any):
-    """Return colored visual diff report."""
-    lines: List[str] = []
+_DIFF_INSERT_TAGS = ("[green]", "[/green]")
+_DIFF_DELETE_TAGS = ("[bright_white on red]", "[/bright_white on red]")
+_DIFF_REPLACE_TAGS = ("[bright_white on green]", "[/bright_white on green]")
 
-    def append(data: Any, style: str | None = None):
-        """Append to lines."""
-        if style:
-            if "\n" in data:
-                for line in data.split("\n"):
-                    lines.append(f"[{style}]{line}[/{style}]\n")
-            else:
-                lines.append(f"[{style}]{data}[/{style}]")
-        else:
-            lines.append(data)
 
+def diff(before: str | Any, after: str | Any):
+    """Return colored visual diff report."""
     if not isinstance(before, str):
-        before = json.dumps(before)
+        before = dump_json(before)
 
     if not isinstance(after, str):
-        after = json.dumps(after)
+        after = dump_json(after)
 
-    matcher = difflib.SequenceMatcher(None, before, after)
-    for opcode, after_0, after_1, before_0, before_1 in matcher.get_opcodes():
+    before_lines = before.splitlines(keepends=True)
+    after_lines = after.splitlines(keepends=True)
+
+    lines: List[str] = []
+    append = lines.append
+
+    matcher = difflib.SequenceMatcher(None, before_lines, after_lines)
+    for opcode, before_start, before_end, after_start, after_end in matcher.get_opcodes():
         if opcode == "equal":
-            append(before[after_0:after_1])
-        elif opcode == "insert":
-            append(after[before_0:before_1], "green")
+            lines.extend(before_lines[before_start:before_end])
+            continue
+
+        if opcode == "insert":
+            segments = ((after_lines[after_start:after_end], _DIFF_INSERT_TAGS),)
         elif opcode == "delete":
-            append(before[after_0:after_1], "bright_white on red")
-        elif opcode == "replace":
-            append(after[before_0:before_1], "bright_white on green")
-            append(before[after_0:after_1], "bright_white on red")
+            segments = ((before_lines[before_start:before_end], _DIFF_DELETE_TAGS),)
+        else:  # replace
+            segments = (
+                (after_lines[after_start:after_end], _DIFF_REPLACE_TAGS),
+                (before_lines[before_start:before_end], _DIFF_DELETE_TAGS),
+            )
+
+        for segment, (open_tag, close_tag) in segments:
+            for line in segment:
+                if line.endswith("\n"):
+                    append(f"{open_tag}{line[:-1]}{close_tag}\n")
+                else:
+                    append(f"{open_tag}{line}{close_tag}")
 
     return "".join(lines)
 
@@ -183,42 +243,62 @@ def query(data: Dict[Any, Any], current_query: str, full_query: str | None = Non
     """Return value for given query string."""
     full_query = full_query if full_query else current_query
 
-    if "." not in current_query or current_query in data:
-        try:
-            result = data[current_query]
-        except KeyError:
-            return None
-
-        return str(result) if isinstance(result, (int, list)) else result
+    while "." in current_query and current_query not in data:
+        key, current_query = current_query.split(".", 1)
 
-    key, remaining_query = current_query.split(".", 1)
+        if key.endswith("[]"):
+            try:
+                lookup_key, nested_key = full_query.rsplit("[].", 1)
+                values = [
+                    nested_fact_value
+                    for nested_data in data[lookup_key]
+                    for nested_fact_key, nested_fact_value in nested_data.items()
+                    if nested_fact_key == nested_key
+                ]
+                return str(values)
+            except KeyError as error:
+                log.warning("could not lookup: %s", error)
+                return ""
+
+        if key in data:
+            data = data[key]
+            continue
+
+        # handle key names with a dot
+        partial_key, current_query = current_query.split(".", 1)
+        data = data[f"{key}.{partial_key}"]
 
     try:
-        if key.endswith("[]"):
-            lookup_key, nested_key = full_query.rsplit("[].", 1)
-            values = [
-                nested_fact_value
-                for data in data[lookup_key]
-                for nested_fact_key, nested_fact_value in data.items()
-                if nested_fact_key == nested_key
-            ]
-            return str(values)
+        result = data[current_query]
+    except KeyError:
+        return None
+
+    return str(result) if isinstance(result, (int, list)) else result
 
-    except KeyError as error:
-        log.warning("could not lookup: %s", error)
-        return ""
 
-    if key in data:
-        return query(data[key], remaining_query, full_query)
+def query_parts(data: Dict[Any, Any], parts: tuple, query_string: str):
+    """Return value for a pre-split dotted query, fall back to query for complex paths."""
+    value = data
+
+    for part in parts:
+        if part.endswith("[]") or not isinstance(value, dict) or part not in value:
+            return query(data, query_string)
+        value = value[part]
+
+    return str(value) if isinstance(value, (int, list)) else value
+
+
+@functools.cache
+def _wasabi_color():
+    """Import the wasabi color helper on first use."""
+    from wasabi import color
 
-    # handle key names with a dot
-    partial_key, remaining_query = remaining_query.split(".", 1)
-    return query(data[f"{key}.{partial_key}"], remaining_query, full_query)
+    return color
 
 
 def diff_string(old, new):
     """Return colored visual diff report."""
-    from wasabi import color
+    color = _wasabi_color()
 
     def green_background(value):
         return color(value, fg=16, bg="green")
@@ -241,6 +321,20 @@ def diff_string(old, new):
     return "".join(output)
 
 
+@functools.lru_cache(maxsize=1024)
+def _slugify_cached(value: str, allow_unicode: bool):
+    """Slugify a string, memoized on the input."""
+    if allow_unicode:
+        value = unicodedata.normalize("NFKC", value)
+        value = _SLUG_STRIP_RE.sub("", value.lower())
+        return _SLUG_DASH_RE.sub("-", value).strip("-_")
+
+    if not value.isascii():
+        value = unicodedata.normalize("NFKD", value).encode("ascii", "ignore").decode("ascii")
+    value = value.lower().translate(_SLUG_TRANSLATE_TABLE)
+    return _SLUG_COLLAPSE_RE.sub("-", value).strip("-_")
+
+
 def slugify(value, allow_unicode=False):
     """
     Slugify.
@@ -251,10 +345,4 @@ def slugify(value, allow_unicode=False):
     underscores, or hyphens. Convert to lowercase. Also strip leading and
     trailing whitespace, dashes, and underscores.
     """
-    value = str(value)
-    if allow_unicode:
-        value = unicodedata.normalize("NFKC", value)
-    else:
-        value = unicodedata.normalize("NFKD", value).encode("ascii", "ignore").decode("ascii")
-    value = re.sub(r"[^\w\s-]", "", value.lower())
-    return re.sub(r"[-\s]+", "-", value).strip("-_")
+    return _slugify_cached(str(value), allow_unicode)
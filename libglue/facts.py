@@ -6,15 +6,21 @@ __license__ = "MIT"
 __status__ = "Development"
 
 
+import functools
+import os
 import sys
-from pathlib import Path
 
 
+@functools.cache
 def is_windows() -> bool:
     """Return True when operating system is Windows."""
-    return sys.platform in ["win32", "cygwin"]
+    return sys.platform in ("win32", "cygwin")
 
 
+@functools.cache
 def is_systemd() -> bool:
     """Return True when operating system is based on systemd (Requires root rights)."""
-    return "systemd" in str(Path("/proc/1/exe").readlink())
+    try:
+        return "systemd" in os.readlink("/proc/1/exe")
+    except OSError:
+        return False
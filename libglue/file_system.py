@@ -5,14 +5,24 @@ __copyright__ = "Copyright 2012-2022 Jasper Poppe"
 __license__ = "MIT"
 __status__ = "Development"
 
+import copy
+import fcntl
+import functools
+import hashlib
 import json
+import math
+import mmap
 import os
 import shutil
-import subprocess
 import sys
+import threading
 import time
+import urllib.error
+import urllib.request
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from contextlib import contextmanager
 from importlib import resources
+from operator import itemgetter
 from pathlib import Path
 from typing import Any
 
@@ -20,9 +30,21 @@ import psutil
 import yaml
 from rich.prompt import Confirm
 
+try:
+    from yaml import CSafeDumper as _YamlDumper
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeDumper as _YamlDumper
+    from yaml import SafeLoader as _YamlLoader
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from .console import console, log
 from .convert import convert
-from .data import load_json, sort_dictionary
+from .data import load_json
 from .shell import shell
 from .types import WriteFlags
 
@@ -39,14 +61,21 @@ def cd(path: Path):
         os.chdir(previous_path)
 
 
-def find_root(directory: Path, match: str = ".git"):
-    """Determine root directory based on file name."""
-    for path in Path(directory).parents:
-        if Path(path / match).exists():
+@functools.lru_cache(maxsize=512)
+def _find_root_cached(directory: Path, match: str):
+    """Walk parent directories for match, cached per starting directory."""
+    for path in directory.parents:
+        if os.path.exists(os.path.join(path, match)):
             return path
     return None
 
 
+def find_root(directory: Path, match: str = ".git"):
+    """Determine root directory based on file name."""
+    return _find_root_cached(Path(directory), match)
+
+
+@functools.lru_cache(maxsize=1)
 def get_cache_directory() -> Path:
     """Return cache directory."""
     if "XDG_CACHE_HOME" in os.environ:
@@ -57,6 +86,7 @@ def get_cache_directory() -> Path:
     return Path.home() / ".cache"
 
 
+@functools.lru_cache(maxsize=1)
 def get_config_directory() -> Path:
     """Return config directory."""
     if "XDG_CONFIG_HOME" in os.environ:
@@ -70,52 +100,137 @@ def get_config_directory() -> Path:
 def load_yaml_resource(resource_name: str, path: str):
     """Load YAML file as Python dictionary from Python resources."""
     with resources.open_binary(resource_name, path) as _fp:
-        return yaml.safe_load(_fp)
+        return yaml.load(_fp, Loader=_YamlLoader)
 
 
 def load_yaml_file(path: Path):
     """Read YAML file and return it as a python dictionary."""
     try:
-        return yaml.safe_load(read_file(path))
-    except ValueError as error:
+        with path.expanduser().open("rb") as file_pointer:
+            return yaml.load(file_pointer, Loader=_YamlLoader)
+    except (OSError, ValueError, yaml.YAMLError) as error:
         log.error("failed to read yaml file (%s)", error)
         raise SystemExit(1) from error
 
 
 def get_directory_paths(directory: Path, type: str):
     """Return sorted list with paths, exit when directory does not exist."""
-    if not directory.is_dir():
+    try:
+        with os.scandir(directory) as entries:
+            return sorted(Path(entry.path) for entry in entries)
+    except (FileNotFoundError, NotADirectoryError):
         console.log(f":person_facepalming: could not find {type} directory: {directory}")
         sys.exit(1)
 
-    return sorted(directory.iterdir())
+
+_PARALLEL_LOAD_THRESHOLD = 8
+
+
+def _map_loader(loader, paths):
+    """Run a file loader over paths, in parallel when the batch is big enough."""
+    if len(paths) < _PARALLEL_LOAD_THRESHOLD:
+        return [loader(path) for path in paths]
+
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+        return list(executor.map(loader, paths))
+
+
+def _yaml_directory_cache_path(directory: Path, names: bool) -> Path:
+    """Return sidecar cache path for a parsed YAML directory."""
+    key = hashlib.blake2b(str(Path(directory).expanduser().resolve()).encode(), digest_size=8).hexdigest()
+    return get_cache_directory() / "libglue" / f"{key}-{'names' if names else 'list'}.json"
+
+
+def _load_yaml_directory_cached(directory: Path, type: str, names: bool):
+    """Load a YAML directory, served from a JSON sidecar cache when it is fresh."""
+    paths = get_directory_paths(directory, type)
+    cache_path = _yaml_directory_cache_path(directory, names)
+
+    if orjson is not None:
+        try:
+            signature = max([os.stat(directory).st_mtime_ns] + [os.stat(path).st_mtime_ns for path in paths])
+            if os.stat(cache_path).st_mtime_ns > signature:
+                return load_json(cache_path.read_bytes())
+        except OSError:
+            pass
+
+    loaded = _map_loader(load_yaml_file, paths)
+    result = dict(zip((file.stem for file in paths), loaded)) if names else loaded
+
+    if orjson is not None:
+        try:
+            create_parent_directory(cache_path)
+            cache_path.write_bytes(orjson.dumps(result, option=orjson.OPT_PASSTHROUGH_DATETIME))
+        except (OSError, TypeError):
+            pass
+
+    return result
 
 
 def load_yaml_directory(directory: Path, type: str):
     """Load and return directory with yaml files."""
-    return [load_yaml_file(file) for file in get_directory_paths(directory, type)]
+    return _load_yaml_directory_cached(directory, type, names=False)
 
 
 def load_yaml_directory_with_names(directory: Path, type: str):
     """Load and return directory with yaml files with file name as key."""
-    return {file.stem: load_yaml_file(file) for file in get_directory_paths(directory, type)}
+    return _load_yaml_directory_cached(directory, type, names=True)
+
+
+_MMAP_PARSE_THRESHOLD = 64 * 1024
+
+
+def _load_json_mapped(file_name: Path):
+    """Parse a JSON file, mapping large files read-only instead of copying them."""
+    if orjson is None:
+        return load_json(read_file_bytes(file_name))
+
+    try:
+        with open(file_name.expanduser(), "rb") as file_pointer:
+            size = os.fstat(file_pointer.fileno()).st_size
+
+            if size < _MMAP_PARSE_THRESHOLD:
+                buffer = file_pointer.read()
+            else:
+                buffer = mmap.mmap(file_pointer.fileno(), size, prot=mmap.PROT_READ)
+    except OSError as error:
+        log.error("failed to read file (%s)", error)
+        raise SystemExit(1) from error
+
+    try:
+        if isinstance(buffer, mmap.mmap):
+            with buffer, memoryview(buffer) as view:
+                return orjson.loads(view)
+
+        return orjson.loads(buffer)
+    except (ValueError, TypeError) as error:
+        log.error("failed to load JSON file: %s (%s)", file_name, error)
+        raise SystemExit(1) from error
+
+
+@functools.lru_cache(maxsize=4096)
+def _load_json_file_cached(file_name: Path, _mtime_ns: int):
+    """Parse JSON file, cached by path and modification time."""
+    return _load_json_mapped(file_name)
 
 
 def load_json_file(path: Path):
     """Read JSON file and return Python dictionary."""
     try:
-        return load_json(read_file(path))
-    except SystemExit as error:
+        result = _load_json_file_cached(path, os.stat(path).st_mtime_ns)
+    except (OSError, SystemExit) as error:
         log.error("failed to load JSON file: %s", path)
         raise SystemExit(1) from error
 
+    # deep copy so caller mutations of nested containers never reach the cache entry
+    return copy.deepcopy(result)
 
-def load_json_file_with_age(file_name: Path):
-    """Read JSON file and return Python dictionary, include age property."""
+
+def _load_json_file_with_age(file_name: Path, mtime_ns: int, now: float | None = None):
+    """Parse JSON file and add an age property computed from a known mtime."""
     try:
-        result = load_json(read_file(file_name))
-        modified_time = os.path.getmtime(file_name)
-        file_age_in_seconds = time.time() - modified_time
+        result = copy.deepcopy(_load_json_file_cached(file_name, mtime_ns))
+        file_age_in_seconds = (now if now is not None else time.time()) - mtime_ns / 1e9
 
         result["age"] = convert(file_age_in_seconds, "seconds", "human")
         return result
@@ -124,23 +239,43 @@ def load_json_file_with_age(file_name: Path):
         raise SystemExit(1) from error
 
 
+def load_json_file_with_age(file_name: Path):
+    """Read JSON file and return Python dictionary, include age property."""
+    return _load_json_file_with_age(file_name, os.stat(file_name).st_mtime_ns)
+
+
 def load_json_directory_with_age(path: Path):
     """Read directory with JSON files and return single Python dictionary."""
-    return sort_dictionary({file: load_json_file_with_age(file) for file in path.iterdir() if file.is_file()})
+    with os.scandir(path) as entries:
+        files = [(Path(entry.path), entry.stat().st_mtime_ns) for entry in entries if entry.is_file()]
+
+    files.sort(key=itemgetter(0))
+    now = time.time()
+    results = _map_loader(lambda item: _load_json_file_with_age(*item, now), files)
+    return dict(zip((file for file, _ in files), results))
 
 
 def read_file(file_name: Path):
     """Read file and return file content as string."""
     try:
-        return file_name.expanduser().read_text()
+        return file_name.expanduser().read_bytes().decode("utf-8")
     except IOError as error:
         log.error("failed to read file (%s)", error)
         raise SystemExit(1) from error
 
 
+def read_file_bytes(file_name: Path):
+    """Read file and return file content as bytes."""
+    try:
+        return file_name.expanduser().read_bytes()
+    except OSError as error:
+        log.error("failed to read file (%s)", error)
+        raise SystemExit(1) from error
+
+
 def write_yaml_file(file_name: Path, data: Any):
     """Write data to YAML file."""
-    file_name.write_text(yaml.safe_dump(data))
+    file_name.write_text(yaml.dump(data, Dumper=_YamlDumper))
 
 
 def write_file(file_name: Path, content: str, quiet=False):
@@ -162,35 +297,68 @@ def create_yaml_file(file_name: Path, data=None):
             with open(file_name, "w") as file_pointer:
                 file_pointer.write("---\n\n{}\n")
         else:
-            write_file(file_name, yaml.safe_dump(data))
+            write_file(file_name, yaml.dump(data, Dumper=_YamlDumper))
+
+
+_yaml_append_cache: dict[Path, tuple[int, list, set]] = {}
 
 
 def yaml_file_append(file_name: Path, value: Any):
     """Extend list in YAML file."""
     create_yaml_file(file_name, [])
 
-    data = yaml.safe_load(read_file(file_name))
+    path = file_name.expanduser()
+    mtime_ns = os.stat(path).st_mtime_ns
+    cached = _yaml_append_cache.get(path)
+
+    if cached is not None and cached[0] == mtime_ns:
+        _, data, seen = cached
+    else:
+        data = list(dict.fromkeys(yaml.load(read_file(file_name), Loader=_YamlLoader)))
+        seen = set(data)
+
+    if value in seen:
+        _yaml_append_cache[path] = (mtime_ns, data, seen)
+        return
+
     data.append(value)
-    write_yaml_file(file_name, list(set(data)))
+    seen.add(value)
+    write_yaml_file(file_name, data)
+    _yaml_append_cache[path] = (os.stat(path).st_mtime_ns, data, seen)
 
 
 def write_json_file(file_name: Path, content: dict[Any, Any] | list[Any], mode: WriteFlags = WriteFlags.write):
     """Write JSON file."""
     log.info(":floppy_disk: writing JSON file: %s", file_name)
+
+    if orjson is not None:
+        with open(file_name.expanduser(), f"{mode.value}b") as file_pointer:
+            file_pointer.write(orjson.dumps(content))
+        return
+
     with open(file_name.expanduser(), mode, encoding="utf-8") as file_pointer:
-        file_pointer.write(json.dumps(content))
+        json.dump(content, file_pointer)
 
 
 def list_dir(path: Path):
-    """Return path iterator with Paths in path when path exists and is directory."""
-    return path.iterdir() if path.is_dir() else []
+    """Return list with Paths in path when path exists and is directory."""
+    try:
+        with os.scandir(path) as entries:
+            return [Path(entry.path) for entry in entries]
+    except (FileNotFoundError, NotADirectoryError):
+        return []
 
 
 def create_directory(directory: Path):
     """Create directory if directory not exists."""
-    if not directory.is_dir():
-        log.info(":file_folder: creating directory: %s", directory)
+    try:
         directory.expanduser().mkdir(parents=True)
+    except FileExistsError:
+        if not directory.expanduser().is_dir():
+            raise
+        return
+
+    log.info(":file_folder: creating directory: %s", directory)
 
 
 def create_parent_directory(directory: Path):
@@ -217,7 +385,52 @@ def delete_cache_directories(directories: list[Path], force: bool = False):
     if force or Confirm.ask("Are you sure?"):
         log.info(":toilet: clearing cache directories")
         for cache_directory in directories:
-            delete_directory(cache_directory)
+            if not cache_directory.is_dir():
+                log.info(":file_folder: directory already vanished: %s", cache_directory)
+                continue
+
+            trash_path = cache_directory.with_name(f"{cache_directory.name}.trash.{os.getpid()}")
+
+            try:
+                os.rename(cache_directory, trash_path)
+            except OSError:
+                delete_directory(cache_directory)
+                continue
+
+            threading.Thread(target=shutil.rmtree, args=(trash_path,), kwargs={"ignore_errors": True}).start()
+
+
+def _scan_single_directory(path: str):
+    """Scan one directory, return its files and subdirectories."""
+    files = []
+    subdirectories = []
+
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                subdirectories.append(entry.path)
+            elif entry.is_file():
+                files.append(Path(entry.path))
+
+    return files, subdirectories
+
+
+def _scan_directory_files(directory: Path):
+    """Collect files under directory recursively, scanning sibling directories in parallel."""
+    files = []
+
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+        pending = {executor.submit(_scan_single_directory, str(directory))}
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                directory_files, subdirectories = future.result()
+                files.extend(directory_files)
+                pending.update(executor.submit(_scan_single_directory, path) for path in subdirectories)
+
+    return files
 
 
 def glob_directory_files(directory: Path, pattern: str = "**/*"):
@@ -226,7 +439,13 @@ def glob_directory_files(directory: Path, pattern: str = "**/*"):
         log.error(":person_facepalming: directory not found: %s", directory)
         raise SystemExit(1)
 
-    files = list(filter(Path.is_file, directory.glob(pattern)))
+    if pattern == "**/*":
+        files = _scan_directory_files(directory)
+    elif pattern == "*":
+        with os.scandir(directory) as entries:
+            files = [Path(entry.path) for entry in entries if entry.is_file()]
+    else:
+        files = [file for file in directory.glob(pattern) if file.is_file()]
 
     if not files:
         log.warning(":person_facepalming: no files matched in directory: %s", directory)
@@ -237,25 +456,35 @@ def glob_directory_files(directory: Path, pattern: str = "**/*"):
 
 def clear_file(path: Path):
     """Delete content of a file."""
-    with open(path, "r+") as file_pointer:
-        file_pointer.truncate(0)
-        file_pointer.close()
+    os.truncate(path, 0)
+
+
+_SIZE_SUFFIXES = ("B", "KB", "MB", "GB", "TB", "PB")
 
 
 def bytes_to_human(bytes: float):
     """Return human size from bytes."""
-    size_suffixes = ["B", "KB", "MB", "GB", "TB", "PB"]
+    if bytes >= 1024:
+        index = min(int(math.log2(bytes)) // 10, len(_SIZE_SUFFIXES) - 1)
+        bytes /= 1 << (10 * index)
+    else:
+        index = 0
+
+    return f'{("%.2f" % bytes).rstrip("0").rstrip(".")} {_SIZE_SUFFIXES[index]}'
 
-    index = 0
-    while bytes >= 1024 and index < len(size_suffixes) - 1:
-        bytes /= 1024.0
-        index += 1
 
-    return f'{("%.2f" % bytes).rstrip("0").rstrip(".")} {size_suffixes[index]}'
+_BLOCK_DEVICES_TTL_SECONDS = 2.0
+_block_devices_cache: tuple[float, dict] | None = None
 
 
 def get_block_devices():
-    """Return dict with block devices."""
+    """Return dict with block devices, cached briefly for interactive prompts."""
+    global _block_devices_cache  # pylint: disable=global-statement
+
+    if _block_devices_cache and time.time() - _block_devices_cache[0] < _BLOCK_DEVICES_TTL_SECONDS:
+        # deep copy so consumers that mutate the device dicts never touch the cache entry
+        return copy.deepcopy(_block_devices_cache[1])
+
     fields = [
         "NAME",
         "LABEL",
@@ -277,7 +506,9 @@ def get_block_devices():
         log.error(":persion_facepalming: lsblk response is empty")
         raise SystemExit(1)
 
-    return json.loads(lsblk_result)
+    devices = load_json(lsblk_result)
+    _block_devices_cache = (time.time(), devices)
+    return copy.deepcopy(devices)
 
 
 def get_removable_block_devices(excluded_uuids: list[str] | None = None, full=False):
@@ -325,6 +556,14 @@ def get_removable_block_devices(excluded_uuids: list[str] | None = None, full=Fa
     return devices
 
 
+def _content_disposition_file_name(response):
+    """Return file name from a Content-Disposition header, if any."""
+    _, _, file_name = response.headers.get("Content-Disposition", "").partition("filename=")
+    # keep only the base name so a hostile header cannot point outside the destination directory
+    file_name = os.path.basename(file_name.strip('" '))
+    return "" if file_name in (".", "..") else file_name
+
+
 def download(url: str, destination: Path):
     """Download file to destination."""
     destination_path = destination.parent
@@ -334,7 +573,31 @@ def download(url: str, destination: Path):
         log.info(f"download destination already exists: {destination}")
         return
 
-    subprocess.call(["wget", "--directory-prefix", destination_path, "--content-disposition", url])
+    part_file = destination.with_name(f"{destination.name}.part")
+    resume_from = part_file.stat().st_size if part_file.is_file() else 0
+
+    request = urllib.request.Request(url)
+    if resume_from:
+        request.add_header("Range", f"bytes={resume_from}-")
+
+    try:
+        response = urllib.request.urlopen(request)
+    except urllib.error.HTTPError as error:
+        if resume_from and error.code == 416:
+            # requested range not satisfiable: the partial file is already complete
+            os.replace(part_file, destination)
+            return
+        raise
+
+    with response:
+        file_name = _content_disposition_file_name(response)
+        target = destination_path / file_name if file_name else destination
+
+        mode = "ab" if resume_from and response.status == 206 else "wb"
+        with open(part_file, mode) as file_pointer:
+            shutil.copyfileobj(response, file_pointer, length=1 << 20)
+
+    os.replace(part_file, target)
 
 
 def untar(source, destination, path=None):
@@ -355,40 +618,85 @@ def requires_superuser_rights():
         raise SystemExit(1)
 
 
+_DISK_PARTITIONS_TTL_SECONDS = 2.0
+_disk_partitions_cache: tuple[float, list] | None = None
+
+
+def _disk_partitions():
+    """Return psutil.disk_partitions(), cached for a short interval."""
+    global _disk_partitions_cache  # pylint: disable=global-statement
+
+    cached = _disk_partitions_cache
+    if cached is not None and time.monotonic() - cached[0] < _DISK_PARTITIONS_TTL_SECONDS:
+        return cached[1]
+
+    partitions = psutil.disk_partitions()
+    _disk_partitions_cache = (time.monotonic(), partitions)
+    return partitions
+
+
+def _invalidate_disk_partitions_cache():
+    """Drop the cached partition table after a mount or unmount."""
+    global _disk_partitions_cache  # pylint: disable=global-statement
+
+    _disk_partitions_cache = None
+
+
 def get_mount_point_devices(device: Path, mount_point: Path):
     """Return mount point devices."""
     return [
         partition
-        for partition in psutil.disk_partitions()
+        for partition in _disk_partitions()
         if partition.device == str(device) and partition.mountpoint == str(mount_point)
     ]
 
 
 def get_device_mount_points(mount_point: Path):
     """Return mount points."""
-    return [partition for partition in psutil.disk_partitions() if partition.mountpoint == str(mount_point)]
+    return [partition for partition in _disk_partitions() if partition.mountpoint == str(mount_point)]
+
+
+def _unescape_mountinfo(field: str) -> str:
+    """Decode the octal escapes mountinfo uses for spaces, tabs, newlines and backslashes."""
+    if "\\" not in field:
+        return field
+
+    # decode the backslash escape last so escaped backslashes cannot form new sequences
+    for escaped, character in (("\\040", " "), ("\\011", "\t"), ("\\012", "\n"), ("\\134", "\\")):
+        field = field.replace(escaped, character)
+
+    return field
+
+
+def _read_mountinfo() -> list[tuple[str, str]]:
+    """Return (mount_point, device) tuples from a single /proc/self/mountinfo read."""
+    entries = []
+
+    with open("/proc/self/mountinfo", encoding="utf-8") as file_pointer:
+        for line in file_pointer.read().splitlines():
+            fields = line.split()
+            separator = fields.index("-")
+            entries.append((_unescape_mountinfo(fields[4]), _unescape_mountinfo(fields[separator + 2])))
+
+    return entries
 
 
 def verify_mount(device: Path, mount_point: Path):
     """Return True when mounted, False when unmounted, exit when mismatch."""
-    if not mount_point.is_mount():
-        return False
+    mounted = [entry for entry in _read_mountinfo() if entry[0] == str(mount_point)]
 
-    device_mount_points = get_device_mount_points(mount_point)
+    if not mounted:
+        return False
 
-    if len(device_mount_points) > 1:
-        device_mount_points = [mount_point.device for mount_point in device_mount_points]
+    if len(mounted) > 1:
+        mounted_devices = [entry[1] for entry in mounted]
         log.critical(
             ":scream_cat: multiple devices are mounted on %s (%s)",
             mount_point,
-            " & ".join(device_mount_points),
+            " & ".join(mounted_devices),
         )
         raise SystemExit(1)
 
-    if not mount_point:
-        log.critical(":scream_cat: expected device %s to be mounted on instead of %s", device, mount_point)
-        raise SystemExit(1)
-
     log.info(":floppy_disk: device %s is already mounted :smile: on %s", device, mount_point)
 
     return True
@@ -400,6 +708,7 @@ def mount(device: Path, mount_point: Path):
         return
 
     shell("sudo", "mount", str(device), str(mount_point))
+    _invalidate_disk_partitions_cache()
 
 
 def unmount(device: Path):
@@ -409,6 +718,7 @@ def unmount(device: Path):
         return
 
     shell("sudo", "umount", str(device))
+    _invalidate_disk_partitions_cache()
 
 
 def select():
@@ -451,7 +761,7 @@ def unmount_tree(root: Path):
 
     mounted_devices = []
 
-    for partition in psutil.disk_partitions():
+    for partition in _disk_partitions():
         if partition.mountpoint.startswith(str(root)):
             mounted_devices.append(partition.mountpoint)
 
@@ -463,6 +773,24 @@ def unmount_tree(root: Path):
     for device in mounted_devices:
         shell("sudo", "umount", device)
 
+    _invalidate_disk_partitions_cache()
+
+
+_BLKRRPART = 0x125F
+
+
+def _rescan_partitions(device: str):
+    """Ask the kernel to re-read a device's partition table."""
+    try:
+        fd = os.open(device, os.O_RDONLY | os.O_NONBLOCK)
+        try:
+            fcntl.ioctl(fd, _BLKRRPART)
+        finally:
+            os.close(fd)
+    except OSError:
+        # no permission or device busy: fall back to the partprobe binary
+        shell("sudo", "partprobe", device)
+
 
 def partition_block_device(block_device: str):
     """
@@ -477,13 +805,15 @@ def partition_block_device(block_device: str):
         "--new=1:0:+200M",
         "--typecode=1:ef00",
         "--attributes=1:set:2",
+        "--largest-new=2",
+        "--typecode=2:8300",
         block_device,
     )
 
-    shell("sudo", "sgdisk", "--largest-new=2", "--typecode=2:8300", block_device)
-    shell("sudo", "partprobe")
+    _rescan_partitions(block_device)
 
 
+@functools.lru_cache(maxsize=64)
 def get_partition_path(block_device: str, partition_number: int):
     """Determine and return partition path."""
     if Path(f"{block_device}{partition_number}").is_block_device():
@@ -527,7 +857,7 @@ def prepare(block_device):
 
     log.info(":table_tennis_paddle_and_ball: creating partition tables")
     os.system(f'sfdisk {block_device["name"]} < ./files/partition_table')
-    shell("partprobe")
+    _rescan_partitions(block_device["name"])
 
     # format_block_device(block_device)
 
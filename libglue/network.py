@@ -5,7 +5,13 @@ __copyright__ = "Copyright 2012-2022 Jasper Poppe"
 __license__ = "MIT"
 __status__ = "Development"
 
-import xmltodict
+import io
+from xml.etree import ElementTree
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
 
 from .shell import shell
 
@@ -14,20 +20,25 @@ def ip_scan(ip_range: str):
     """Scan IP addresses and return dictionary."""
     xml_response = shell("sudo", "nmap", "-sP", ip_range, "-oX", "-")
 
+    iterparse = lxml_etree.iterparse if lxml_etree is not None else ElementTree.iterparse
+
     result = []
-    for host in xmltodict.parse(
-        xml_response, dict_constructor=dict, force_list=("address",), attr_prefix=""
-    )["nmaprun"]["host"]:
-        item = {"state": host["status"]["state"]}
+    for _event, element in iterparse(io.BytesIO(xml_response), events=("end",)):
+        if element.tag != "host":
+            continue
+
+        item = {"state": element.find("status").get("state")}
 
-        if "hostnames" in host and host["hostnames"]:
-            item["name"] = host["hostnames"]["hostname"]["name"]
+        hostname = element.find("hostnames/hostname")
+        if hostname is not None:
+            item["name"] = hostname.get("name")
 
-        for address in host["address"]:
-            item[address["addrtype"]] = address["addr"]
-            if address["addrtype"] == "mac" and "vendor" in address:
-                item["vendor"] = address["vendor"]
+        for address in element.iterfind("address"):
+            item[address.get("addrtype")] = address.get("addr")
+            if address.get("addrtype") == "mac" and address.get("vendor") is not None:
+                item["vendor"] = address.get("vendor")
 
         result.append(item)
+        element.clear()
 
     return result
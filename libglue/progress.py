@@ -17,37 +17,42 @@ from rich.progress import (
 )
 from rich.table import Table
 
+_OVERALL_COLUMNS = (
+    "{task.description} {task.percentage:>3.0f}%",
+    SpinnerColumn(),
+    BarColumn(),
+    TextColumn("[progress.percentage] [{task.completed:05}/{task.total}]"),
+    TimeRemainingColumn(),
+)
+
+_JOB_COLUMNS = ("[{task.completed:03}/{task.total:03}] {task.description}",)
+
+_DOWNLOAD_COLUMNS = (
+    TextColumn("[bold blue]{task.fields[file_name]}", justify="right"),
+    BarColumn(bar_width=None),
+    "[progress.percentage]{task.percentage:>3.1f}%",
+    "•",
+    DownloadColumn(),
+    "•",
+    TransferSpeedColumn(),
+    "•",
+    TimeRemainingColumn(),
+)
+
 
 def create_overall_progress():
     """Overall progress template."""
-    return Progress(
-        "{task.description} {task.percentage:>3.0f}%",
-        SpinnerColumn(),
-        BarColumn(),
-        TextColumn("[progress.percentage] [{task.completed:05}/{task.total}]"),
-        TimeRemainingColumn(),
-    )
+    return Progress(*_OVERALL_COLUMNS)
 
 
 def create_job_progress():
     """Job progress template."""
-    return Progress("[{task.completed:03}/{task.total:03}] {task.description}")
+    return Progress(*_JOB_COLUMNS)
 
 
 def create_download_progress(transient: bool = True):
     """Download progress template."""
-    return Progress(
-        TextColumn("[bold blue]{task.fields[file_name]}", justify="right"),
-        BarColumn(bar_width=None),
-        "[progress.percentage]{task.percentage:>3.1f}%",
-        "•",
-        DownloadColumn(),
-        "•",
-        TransferSpeedColumn(),
-        "•",
-        TimeRemainingColumn(),
-        transient=transient,
-    )
+    return Progress(*_DOWNLOAD_COLUMNS, transient=transient)
 
 
 def create_progress_table(total: int):
@@ -6,7 +6,8 @@ __license__ = "MIT"
 __status__ = "Development"
 
 
-from requests import request
+from requests import Session
+from requests.adapters import HTTPAdapter, Retry
 
 
 class RestApiClient:
@@ -18,11 +19,16 @@ class RestApiClient:
         self.headers = headers
         self.verify_ssl = verify_ssl
 
+        self.session = Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=10, max_retries=Retry(total=2, backoff_factor=0.1))
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
     def call(self, endpoint: str, method="GET", parameters=None):
         """Call REST API."""
         method = method.upper()
 
-        response = request(
+        response = self.session.request(
             method,
             self.api_url + endpoint,
             headers=self.headers,
@@ -36,3 +42,15 @@ class RestApiClient:
             response.raise_for_status()
 
         return response.json()
+
+    def close(self):
+        """Close the pooled HTTP session."""
+        self.session.close()
+
+    def __enter__(self):
+        """Return the client for use as a context manager."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Close the session on context exit."""
+        self.close()
@@ -6,30 +6,56 @@ __license__ = "MIT"
 __status__ = "Development"
 
 
+import logging
 import subprocess
 import sys
 
 from .console import log
 
 
-def shell(*args, **kwargs):
-    """Run a local command."""
-    log.info(":computer: %s", " ".join(args))
+_SHELL_CACHE: dict = {}
 
-    with subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, stdin=sys.stdin, **kwargs) as process:
-        stdout, stderr = process.communicate()
-        return_code = process.wait()
 
-        if return_code:
-            if stdout:
-                log.info(stdout.strip())
-                return stdout
+def clear_shell_cache():
+    """Drop all memoized shell results."""
+    _SHELL_CACHE.clear()
 
-            if stderr:
-                log.error(stderr.strip())
-                raise SystemError(1)
 
-        if stdout:
-            return stdout.strip()
+def shell(*args, cache: bool = False, **kwargs):
+    """Run a local command, optionally memoizing the result for repeated read-only commands."""
+    cache_key = None
+
+    if cache:
+        env = kwargs.get("env")
+        cache_key = (args, kwargs.get("cwd"), None if env is None else tuple(sorted(env.items())))
+
+        if cache_key in _SHELL_CACHE:
+            return _SHELL_CACHE[cache_key]
+
+    if log.isEnabledFor(logging.INFO):
+        log.info(":computer: %s", " ".join(args))
 
-        return stderr
+    kwargs.setdefault("close_fds", False)
+
+    with subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, stdin=sys.stdin, **kwargs) as process:
+        stdout, stderr = process.communicate()
+        return_code = process.returncode
+
+    if return_code:
+        if stdout:
+            log.info(stdout.strip())
+            result = stdout
+        elif stderr:
+            log.error(stderr.strip())
+            raise SystemError(1)
+        else:
+            result = stderr
+    elif stdout:
+        result = stdout.strip()
+    else:
+        result = stderr
+
+    if cache_key is not None:
+        _SHELL_CACHE[cache_key] = result
+
+    return result
@@ -6,24 +6,45 @@ __license__ = "MIT"
 __status__ = "Development"
 
 
+import atexit
 import logging
+import select
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import List, Tuple
 
 from paramiko.client import SSHClient
-from rich import print
 from scp import SCPClient
 
 from .console import log
 
+logging.getLogger("paramiko").setLevel(logging.WARNING)
+
+_SSH_CACHE: dict[tuple, SSHClient] = {}
+
+
+def _close_cached_ssh_connections():
+    """Close every cached SSH connection at interpreter exit."""
+    for ssh_client in _SSH_CACHE.values():
+        ssh_client.close()
+
+
+atexit.register(_close_cached_ssh_connections)
+
 
 def initialize_ssh_connection(host: str, gateway: str | List[str] | None = None):
     """Connect via gateway."""
     if isinstance(gateway, str):
         gateway = [gateway]
 
-    logging.basicConfig()
-    logging.getLogger("paramiko").setLevel(logging.WARNING)
+    cache_key = (host, tuple(gateway or ()))
+    cached = _SSH_CACHE.get(cache_key)
+
+    if cached is not None:
+        transport = cached.get_transport()
+        if transport is not None and transport.is_active():
+            return cached
 
     ssh_client = SSHClient()
     ssh_client.load_system_host_keys()
@@ -37,23 +58,50 @@ def initialize_ssh_connection(host: str, gateway: str | List[str] | None = None)
         gateway_socket = None
 
     ssh_client.connect(hostname=host, port=22, sock=gateway_socket)
+    _SSH_CACHE[cache_key] = ssh_client
     return ssh_client
 
 
 def ssh_run(ssh_client: SSHClient, command: str):
-    """Run SSH command."""
-    _stdin, stdout, stderr = ssh_client.exec_command(command)
-
-    print(stdout.read().decode())
-    print(stderr.read().decode())
-
+    """Run SSH command, streaming its output as it arrives."""
     if ssh_client is None:
         log.warning(":person_facepalming: SSH connection failed")
         raise SystemExit(1)
 
+    channel = ssh_client.get_transport().open_session()
+    channel.exec_command(command)
+
+    while True:
+        select.select([channel], [], [], 0.1)
+
+        while channel.recv_ready():
+            sys.stdout.buffer.write(channel.recv(65536))
+
+        while channel.recv_stderr_ready():
+            sys.stderr.buffer.write(channel.recv_stderr(65536))
+
+        if channel.exit_status_ready() and not channel.recv_ready() and not channel.recv_stderr_ready():
+            break
+
+    sys.stdout.buffer.flush()
+    sys.stderr.buffer.flush()
+    channel.recv_exit_status()
+
     return ssh_client
 
 
+def ssh_run_many(jobs: List[Tuple[SSHClient, str]]):
+    """Run multiple SSH commands concurrently, return (stdout, stderr) per job."""
+
+    def _run(job: Tuple[SSHClient, str]):
+        ssh_client, command = job
+        _stdin, stdout, stderr = ssh_client.exec_command(command)
+        return stdout.read().decode(), stderr.read().decode()
+
+    with ThreadPoolExecutor(max_workers=min(8, len(jobs) or 1)) as executor:
+        return list(executor.map(_run, jobs))
+
+
 def scp(ssh_client: SSHClient, source: Path, destination: Path | None = None) -> None:
     """SCP file from active SSH client."""
     ssh_client_transport = ssh_client.get_transport()
@@ -68,3 +116,20 @@ def scp(ssh_client: SSHClient, source: Path, destination: Path | None = None) ->
         scp_client.get(str(source.expanduser()))
     else:
         scp_client.get(str(source.expanduser()), str(destination.expanduser()))
+
+
+def scp_many(ssh_client: SSHClient, pairs: List[Tuple[Path, Path]]) -> None:
+    """Fetch multiple remote files in parallel over one SSH transport."""
+    if ssh_client.get_transport() is None:
+        log.warning(":person_facepalming: SSH transport failed")
+        raise SystemExit(1)
+
+    def _fetch(pair: Tuple[Path, Path]):
+        source, destination = pair
+
+        # one SFTP session per worker: sessions share the transport but are not thread-safe themselves
+        with ssh_client.open_sftp() as sftp_client:
+            sftp_client.get(str(source.expanduser()), str(destination.expanduser()))
+
+    with ThreadPoolExecutor(max_workers=min(8, len(pairs) or 1)) as executor:
+        list(executor.map(_fetch, pairs))
@@ -6,8 +6,12 @@ __license__ = "MIT"
 __status__ = "Development"
 
 
+import asyncio
+import itertools
+import logging
 from pathlib import Path
 
+from .console import log
 from .shell import shell
 
 
@@ -24,18 +28,16 @@ def __build_rsync_command(
         command.append("--dry-run")
 
     if excludes:
-        for exclude in excludes:
-            command.append("--exclude")
-            command.append(exclude)
+        command.extend(itertools.chain.from_iterable(("--exclude", exclude) for exclude in excludes))
 
     command.append(f"{source}/")
 
     if isinstance(destination, str):
-        command += ["-e", "ssh"]
+        command.extend(("-e", "ssh"))
 
     command.append(str(destination))
 
-    return command
+    return tuple(command)
 
 
 def rsync(
@@ -46,3 +48,29 @@ def rsync(
 ):
     """Rsync wrapper."""
     shell(*__build_rsync_command(source, destination, excludes, dry))
+
+
+def rsync_many(jobs: list[tuple[Path, str | Path, list[str] | None]], dry: bool = False):
+    """Run multiple rsync transfers concurrently, each job is (source, destination, excludes)."""
+
+    async def _run(job):
+        source, destination, excludes = job
+        command = __build_rsync_command(source, destination, excludes, dry)
+
+        if log.isEnabledFor(logging.INFO):
+            log.info(":computer: %s", " ".join(command))
+
+        process = await asyncio.create_subprocess_exec(
+            *command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+        stdout, stderr = await process.communicate()
+
+        if process.returncode and stderr:
+            log.error(stderr.strip())
+
+        return stdout
+
+    async def _gather():
+        return await asyncio.gather(*(_run(job) for job in jobs))
+
+    return asyncio.run(_gather())
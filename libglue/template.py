@@ -5,6 +5,7 @@ __copyright__ = "Copyright 2012-2022 Jasper Poppe"
 __license__ = "MIT"
 __status__ = "Development"
 
+import functools
 import os
 import string
 from pathlib import Path
@@ -24,10 +25,29 @@ class Template:
         self.jinja_env = jinja2.Environment(
             extensions=["jinja2.ext.do", "jinja2.ext.loopcontrols"], loader=jinja2.FileSystemLoader(template_path)
         )
+        self._compiled: dict[str, tuple[int, jinja2.Template]] = {}
+
+    def _get_template(self, file_name: Path) -> jinja2.Template:
+        """Return the compiled template for a file, recompiling only when it changes on disk."""
+        key = str(file_name)
+
+        try:
+            mtime_ns = os.stat(os.path.expanduser(key)).st_mtime_ns
+        except OSError as error:
+            log.error("failed to read file (%s)", error)
+            raise SystemExit(1) from error
+
+        cached = self._compiled.get(key)
+
+        if cached is None or cached[0] != mtime_ns:
+            cached = (mtime_ns, self.jinja_env.from_string(read_file(file_name)))
+            self._compiled[key] = cached
+
+        return cached[1]
 
     def render(self, file_name: Path, data: Any):
         """Render jinja template."""
-        template = self.jinja_env.from_string(read_file(file_name))
+        template = self._get_template(file_name)
 
         try:
             return template.render(data)
@@ -37,19 +57,33 @@ class Template:
             return None
 
     def write(self, source: Path, destination: Path, data: Any):
-        """Render and write Jinja2 template."""
-        content = self.render(source, data)
+        """Render Jinja2 template, streaming the output to the destination file."""
+        template = self._get_template(source)
 
-        if not content:
+        target = destination.expanduser()
+        part_file = target.with_name(f"{target.name}.part")
+
+        try:
+            template.stream(data).dump(str(part_file), encoding="utf-8")
+        except jinja2.exceptions.UndefinedError as error:
+            msg = "failed to render template: %s (data: %s) (%s)"
+            log.error(msg, source, data, error)
+            part_file.unlink(missing_ok=True)
             return False
 
-        destination.expanduser().write_text(content)
+        os.replace(part_file, target)
         return True
 
 
+@functools.lru_cache(maxsize=128)
+def _compile_template(text: str) -> string.Template:
+    """Compile a string Template, cached on the template text."""
+    return string.Template(text)
+
+
 def render_template(source: Path, destination: Path, template_vars: Any, chmod: int | None = None):
     """Render template with string Template class."""
-    template = string.Template(read_file(source))
+    template = _compile_template(read_file(source))
     write_file(destination, template.substitute(template_vars))
 
     if chmod is not None: